@@ -17,13 +17,26 @@ PLAYER_SPEED = 7
 BULLET_SPEED = 20
 BULLET_LIFETIME = 2.0 # seconds
 
+_rect_images = {} # (color, size) -> Surface shared by every sprite drawn with it
+
+def shared_color_rect(sprite, color, size):
+    """Like sprite.colorRect, but reuses one Surface per (color, size) instead of allocating per sprite."""
+    key = (tuple(color), tuple(size))
+    image = _rect_images.get(key)
+    if image is None:
+        sprite.colorRect(color, size)
+        _rect_images[key] = sprite.imageMaster
+    else:
+        sprite.imageMaster = image
+        sprite.imageAngle = sprite.imageAngle # Rebuild self.image from the shared master
+
 class Bullet(simpleGENetworking.NetSprite):
     def __init__(self, scene, parent, target_pos):
         super().__init__(scene, is_local=True)
         self.type = "bullet"
         self.parent = parent # The Player object who shot this
         self.owner_id = parent.net_id
-        self.colorRect((255, 255, 255), (BULLET_SIZE, BULLET_SIZE))
+        shared_color_rect(self, (255, 255, 255), (BULLET_SIZE, BULLET_SIZE))
         self.x = parent.x
         self.y = parent.y
         self.boundAction = self.CONTINUE
@@ -56,7 +69,7 @@ class Player(simpleGENetworking.NetSprite):
         self.kills = 0
         self.deaths = 0
         self.color = (random.randint(50, 255), random.randint(50, 255), random.randint(50, 255))
-        self.colorRect(self.color, (PLAYER_SIZE, PLAYER_SIZE))
+        shared_color_rect(self, self.color, (PLAYER_SIZE, PLAYER_SIZE))
         self.moveSpeed = PLAYER_SPEED
         
         # Random spawn
@@ -284,7 +297,6 @@ class ShooterLogicMixin:
                     # Update existing
                     s = self.managed_sprites[sprite_id]
                     s.x, s.y, s.imageAngle = x, y, angle
-                    s.last_seen = time.time()
                     # Update visual rect
                     s.rect.center = (s.x, s.y)
                 else:
@@ -294,14 +306,13 @@ class ShooterLogicMixin:
                     new_s.sprite_id = sprite_id
                     new_s.type = s_type
                     new_s.owner_id = bullet_owner
-                    new_s.last_seen = time.time()
                     
                     # Setup visuals
                     if s_type == "player":
-                        new_s.colorRect(color, (PLAYER_SIZE, PLAYER_SIZE))
+                        shared_color_rect(new_s, color, (PLAYER_SIZE, PLAYER_SIZE))
                         # Could add name label above head?
                     elif s_type == "bullet":
-                        new_s.colorRect((255, 255, 255), (BULLET_SIZE, BULLET_SIZE))
+                        shared_color_rect(new_s, (255, 255, 255), (BULLET_SIZE, BULLET_SIZE))
                     
                     new_s.x, new_s.y, new_s.imageAngle = x, y, angle
                     self.managed_sprites[sprite_id] = new_s
@@ -337,14 +348,13 @@ class ShooterLogicMixin:
                             self.managed_sprites[bullet_id].kill()
                             del self.managed_sprites[bullet_id]
 
-        # 4. Cleanup missing remote sprites (with timeout for packet loss)
+        # 4. Cleanup missing remote sprites
+        # The state holds every client's latest sprite list (lost packets are recovered by keyframes),
+        # and this only runs when it changes, so anything missing from it is gone for good
         to_delete = []
-        now = time.time()
         for sid, sprite in self.managed_sprites.items():
             if not sprite.is_local and sid not in current_remote_sprites:
-                # If we haven't seen this sprite in > 200ms, assume it's gone
-                if now - getattr(sprite, 'last_seen', 0) > 0.2:
-                    to_delete.append(sid)
+                to_delete.append(sid)
         
         for sid in to_delete:
             self.managed_sprites[sid].kill()
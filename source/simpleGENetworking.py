@@ -8,8 +8,13 @@ Key Features:
 	- TCP: Used for reliable connection setup, ID assignment, and handshake via `NetUtils`.
 	- UDP: Used for fast, real-time game state updates.
 - Object Serialization: 
-	- Uses `pickle` for both TCP messages and UDP game state payloads, allowing generic Python
-	objects (tuples, dicts, etc.) to be transmitted.
+	- Client -> server UDP updates are a fixed `struct` header (frame type + 16-byte binary client ID)
+	followed by a `msgspec` msgpack payload, so payloads must be plain data (dicts, lists, tuples,
+	str, numbers, None). Tuples arrive as lists.
+	- The server forwards each client's msgpack payload untouched: its world state broadcast is a
+	`struct` header followed by (client ID, length, payload) records.
+	- The TCP handshake and ID assignment are fixed `struct` frames; other TCP messages are msgpack.
+	Nothing received from the network is ever unpickled.
 - Connection Management: 
 	- Includes heartbeat logic to detect server disconnects (`DISCONNECT_TIMEOUT`).
 	- Handles connection timeouts for clients connecting to invalid IPs (`CONNECTION_TIMEOUT`).
@@ -19,11 +24,13 @@ Key Features:
 	synchronization logic (`handle_network_state`, `get_local_state`).
 - Pluggable Discovery:
 	- Supports different game discovery mechanisms (e.g., LAN Broadcast).
+	- LAN beacons are a fixed `struct` layout with a magic prefix, so packets from arbitrary LAN
+	peers are checked by size and magic and never unpickled.
 	- Designed to be extensible for future discovery protocols (e.g., Bluetooth (if someone dares, lol)).
 
 Security Warning:
-This module uses `pickle` for serialization. Only use this networking framework on trusted
-networks. Processing pickled data from untrusted sources is a security risk.
+Traffic is neither authenticated nor encrypted. Only use this networking framework on trusted
+networks.
 """
 
 if __name__ == "__main__":
@@ -31,7 +38,9 @@ if __name__ == "__main__":
 	exit(1)
 
 from source.simpleGE import simpleGE
-import socket, threading, pickle, struct, uuid, time, zlib
+import socket, threading, selectors, struct, uuid, time, zlib, collections
+import ctypes, errno, os, sys
+import msgspec
 
 VERBOSE = False
 
@@ -43,11 +52,237 @@ DISCONNECT_TIMEOUT = 5.0
 CONNECTION_TIMEOUT = 7.0
 DISCOVERY_TIMEOUT = 3
 ID_WAIT_TIMEOUT = 2.0
-ID_WAIT_INTERVAL = 0.05
 UDP_SOCKET_TIMEOUT = 1.0
 BROADCAST_INTERVAL = 2
 UDP_BUFFER_SIZE = 65536
+TCP_SOCKET_BUFFER = 262144 # SO_SNDBUF / SO_RCVBUF for TCP control sockets
+UDP_SOCKET_BUFFER = 4194304 # SO_SNDBUF / SO_RCVBUF for server and client UDP sockets (absorbs bursts)
+SENDMMSG_BATCH = 100 # Max datagrams per sendmmsg() call (diminishing returns past this)
+RECVMMSG_BATCH = 32 # Max datagrams drained per recvmmsg() call by the server listener
 SERVER_TPS = 30 # Ticks per second for broadcast loop
+REAP_INTERVAL = 1.0 # Seconds between server sweeps for clients silent longer than DISCONNECT_TIMEOUT
+KEYFRAME_INTERVAL = 2.0 # Seconds between full world-state broadcasts (deltas are sent in between)
+TCP_RECV_CHUNK = 4096 # Bytes read per recv() by the TCP event loop
+TCP_SEND_QUEUE_LIMIT = 64 # Queued outbound TCP frames per client before it is disconnected as too slow
+
+# Client -> server UDP frame types (first byte of every frame)
+FRAME_STATE = 0x01 # Header followed by a msgpack payload
+FRAME_REGISTER = 0x02 # Header only; tells the server our UDP address
+CLIENT_SEND_RATE = 20 # Max local state updates per second sent by a client
+CLIENT_KEEPALIVE_INTERVAL = 1.0 # Max seconds a client goes without sending the server a UDP frame
+NET_STATE_SCALE = 10 # NetSprite x/y/angle are sent as ints in 1/10th units (fits int16 on normal maps)
+
+# UDP datagram encodings (first byte of every game datagram, both directions; see NetUtils.pack_udp_payload)
+UDP_RAW = 0x00 # Rest of the datagram is the frame as-is
+UDP_ZLIB = 0x01 # Rest of the datagram is the zlib-compressed frame
+UDP_COMPRESS_THRESHOLD = 256 # Frames shorter than this (bytes) aren't worth compressing
+MAX_BROADCAST_SIZE = 4194304 # Largest decompressed broadcast a client accepts (bounds zlib inflation)
+
+# Server -> client broadcast kinds (first byte of every broadcast frame)
+STATE_FULL = 0x01 # Every client's state (keyframe)
+STATE_DELTA = 0x02 # Only entries changed or removed since the last broadcast
+
+# TCP message tags (first byte after the 4-byte length header)
+TCP_MSG_OBJECT = 0x00 # msgpack-encoded object (send/receive_object_over_tcp)
+TCP_MSG_HANDSHAKE = 0x01 # client -> server, _HANDSHAKE frame
+TCP_MSG_ID_ASSIGNMENT = 0x02 # server -> client, _ID_ASSIGNMENT frame
+TCP_MSG_KEYFRAME_REQUEST = 0x03 # client -> server, no body: a delta was lost, send a full state
+
+# TCP length header, and length header + message tag as written by send_frame_over_tcp
+_TCP_HEADER = struct.Struct('>I')
+_TCP_FRAME_HEADER = struct.Struct('>IB')
+# Port field of a raw sockaddr_in (network byte order)
+_NET_PORT = struct.Struct('!H')
+_SOCKADDR_FAMILY = struct.pack('=H', socket.AF_INET)
+_UDP_RAW_PREFIX = bytes([UDP_RAW])
+_UDP_ZLIB_PREFIX = bytes([UDP_ZLIB])
+# Client -> server UDP frame header: frame type, binary UUID of the sender (payload follows)
+_FRAME = struct.Struct('>B16s')
+# Server -> client broadcast: header (kind, sequence number, changed count, removed count), then
+# `changed` x (_STATE_RECORD + that client's raw msgpack payload), then `removed` x 16-byte client ID
+_STATE_HEADER = struct.Struct('>BIHH')
+_STATE_RECORD = struct.Struct('>16sH') # Binary client UUID, payload length
+_MAX_STATE_PAYLOAD = 0xFFFF # Largest client payload a _STATE_RECORD length can describe
+# Handshake frames: game ID (UTF-8, truncated/zero-padded to 32 bytes), client UUID, server UDP port
+_HANDSHAKE = struct.Struct('>32s')
+_ID_ASSIGNMENT = struct.Struct('>32s16sH')
+# TCP connection states for the server's event loop
+TCP_STATE_HANDSHAKE = 0 # Waiting for the client's handshake frame
+TCP_STATE_STEADY = 1 # ID assigned; connection is only watched for disconnects
+# LAN discovery beacon: magic, format version, TCP port, host name, game ID (UTF-8, zero-padded)
+BEACON_MAGIC = b'SGE1'
+BEACON_VERSION = 1
+_BEACON = struct.Struct('!4sHH32s32s')
+_BEACON_FIELD = struct.Struct('32s') # Pads/truncates a game ID the same way for comparison
+# Reused encoder/decoder for client payloads and TCP messages
+_ENC = msgspec.msgpack.Encoder()
+_PAYLOAD_DEC = msgspec.msgpack.Decoder()
+
+# --- Batched UDP I/O (Linux sendmmsg/recvmmsg via ctypes) ---
+
+class _IOVec(ctypes.Structure):
+	_fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+class _MsgHdr(ctypes.Structure):
+	_fields_ = [
+		("msg_name", ctypes.c_void_p), ("msg_namelen", ctypes.c_uint32),
+		("msg_iov", ctypes.POINTER(_IOVec)), ("msg_iovlen", ctypes.c_size_t),
+		("msg_control", ctypes.c_void_p), ("msg_controllen", ctypes.c_size_t),
+		("msg_flags", ctypes.c_int),
+	]
+
+class _MMsgHdr(ctypes.Structure):
+	_fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+def _load_libc_function(name, argtypes):
+	"""Returns the named libc function if available (Linux only), otherwise None."""
+	if not sys.platform.startswith("linux"):
+		return None
+	try:
+		libc = ctypes.CDLL(None, use_errno=True)
+		fn = getattr(libc, name)
+	except (OSError, AttributeError):
+		return None
+	fn.argtypes = argtypes
+	fn.restype = ctypes.c_int
+	return fn
+
+_sendmmsg = _load_libc_function("sendmmsg", [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int])
+_recvmmsg = _load_libc_function("recvmmsg", [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_void_p])
+
+class _UDPBatchReceiver:
+	"""
+	Drains up to `vlen` queued datagrams from a non-blocking UDP socket per call.
+	
+	On Linux a single recvmmsg() fills a set of preallocated buffers; elsewhere it falls back to
+	one `recvfrom_into`. Returned views point into those buffers and are only valid until the next
+	call to `recv()`.
+	"""
+	def __init__(self, sock, vlen=RECVMMSG_BATCH, buffer_size=UDP_BUFFER_SIZE):
+		self.sock = sock
+		self.buffer_size = buffer_size
+		self.vlen = vlen if _recvmmsg else 1
+		self.buffers = [bytearray(buffer_size) for _ in range(self.vlen)]
+		self.views = [memoryview(b) for b in self.buffers]
+		if _recvmmsg is None:
+			return
+
+		self._names = ((ctypes.c_char * 16) * self.vlen)()
+		self._iovs = (_IOVec * self.vlen)()
+		self._msgs = (_MMsgHdr * self.vlen)()
+		self._c_buffers = [(ctypes.c_char * buffer_size).from_buffer(b) for b in self.buffers]
+		for i in range(self.vlen):
+			self._iovs[i].iov_base = ctypes.addressof(self._c_buffers[i])
+			self._iovs[i].iov_len = buffer_size
+			hdr = self._msgs[i].msg_hdr
+			hdr.msg_name = ctypes.addressof(self._names[i])
+			hdr.msg_iov = ctypes.pointer(self._iovs[i])
+			hdr.msg_iovlen = 1
+
+	def recv(self):
+		"""Returns a list of (data_view, (ip, port)) for the datagrams currently queued."""
+		if _recvmmsg is None:
+			try:
+				nbytes, addr = self.sock.recvfrom_into(self.buffers[0], self.buffer_size)
+			except (BlockingIOError, InterruptedError):
+				return []
+			return [(self.views[0][:nbytes], addr)]
+
+		for i in range(self.vlen):
+			# The kernel overwrites these on every call
+			self._msgs[i].msg_hdr.msg_namelen = 16
+			self._msgs[i].msg_hdr.msg_flags = 0
+		count = _recvmmsg(self.sock.fileno(), ctypes.addressof(self._msgs), self.vlen, socket.MSG_DONTWAIT, None)
+		if count < 0:
+			err = ctypes.get_errno()
+			if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+				return []
+			raise OSError(err, os.strerror(err))
+
+		received = []
+		for i in range(count):
+			msg = self._msgs[i]
+			if msg.msg_hdr.msg_flags & socket.MSG_TRUNC:
+				continue # Larger than our buffer, can't be decoded
+			name = self._names[i].raw
+			addr = (socket.inet_ntoa(name[4:8]), _NET_PORT.unpack_from(name, 2)[0])
+			received.append((self.views[i][:msg.msg_len], addr))
+		return received
+
+class _UDPBatchSender:
+	"""
+	Sends one payload to many addresses from a UDP socket.
+	
+	On Linux the iovec/mmsghdr/sockaddr arrays are allocated once and reused (grown as needed), and
+	each batch of up to SENDMMSG_BATCH datagrams is a single sendmmsg() call. Elsewhere it falls back
+	to one `sendto` per address.
+	"""
+	def __init__(self, sock, capacity=16):
+		self.sock = sock
+		self.capacity = 0
+		if _sendmmsg is None:
+			return
+		# Every message points at the same iovec; only its target buffer changes per call
+		self._iov = _IOVec()
+		self._iov_ptr = ctypes.pointer(self._iov)
+		self._grow(capacity)
+
+	def _grow(self, capacity):
+		"""(Re)allocates the header and address arrays for at least `capacity` destinations."""
+		self.capacity = capacity
+		self._loaded_sockaddrs = None # The sockaddrs sequence currently written into _names
+		self._names = ((ctypes.c_char * 16) * capacity)()
+		self._msgs = (_MMsgHdr * capacity)()
+		for i in range(capacity):
+			hdr = self._msgs[i].msg_hdr
+			hdr.msg_name = ctypes.addressof(self._names[i])
+			hdr.msg_namelen = 16
+			hdr.msg_iov = self._iov_ptr
+			hdr.msg_iovlen = 1
+
+	def send(self, payload, addrs, sockaddrs=None):
+		"""
+		Sends `payload` to every (ip, port) in `addrs`. Returns the indices that could not be sent.
+		`sockaddrs` optionally supplies the matching raw sockaddr_in bytes so they aren't rebuilt per call.
+		Passing the same (immutable) sockaddrs object again skips rewriting the destination addresses.
+		"""
+		if _sendmmsg is None:
+			return NetUtils._sendto_loop(self.sock, payload, addrs)
+
+		n = len(addrs)
+		if n > self.capacity:
+			self._grow(max(n, self.capacity * 2))
+		if sockaddrs is None:
+			sockaddrs = [NetUtils._pack_sockaddr_in(addr) for addr in addrs]
+		if sockaddrs is not self._loaded_sockaddrs:
+			# Membership changed (or a one-off list): rewrite the destinations
+			names = self._names
+			for i, sockaddr in enumerate(sockaddrs):
+				names[i].raw = sockaddr
+			self._loaded_sockaddrs = sockaddrs if isinstance(sockaddrs, tuple) else None
+		data = ctypes.c_char_p(payload) # Keeps the buffer referenced for the duration of the calls
+		self._iov.iov_base = ctypes.cast(data, ctypes.c_void_p)
+		self._iov.iov_len = len(payload)
+
+		failed = []
+		fd = self.sock.fileno()
+		base = ctypes.addressof(self._msgs)
+		offset = 0
+		while offset < n:
+			count = min(n - offset, SENDMMSG_BATCH)
+			sent = _sendmmsg(fd, base + offset * ctypes.sizeof(_MMsgHdr), count, 0)
+			if sent < 0:
+				err = ctypes.get_errno()
+				if err in (errno.EAGAIN, errno.EWOULDBLOCK):
+					# Send buffer full: drop the rest of this broadcast
+					failed.extend(range(offset, n))
+					break
+				# This destination failed (e.g. unreachable), skip it and keep going
+				failed.append(offset)
+				offset += 1
+			else:
+				offset += sent
+		return failed
 
 class NetUtils:
 	"""Utility class for common network operations (logging, TCP sending/receiving)."""
@@ -60,45 +295,61 @@ class NetUtils:
 			print(f"[{timestamp}][{tag}] {message}")
 
 	@staticmethod
-	def send_object_over_tcp(socket_obj, object_data):
+	def send_frame_over_tcp(socket_obj, tag, body):
 		"""
-		Pickles an object and sends it over TCP with a length header.
+		Sends a tagged message over TCP with a length header.
 		
 		TCP is a stream protocol, so we need to tell the receiver exactly how many bytes
-		to read for this specific message. We prepend a 4-byte integer (length of the pickled data)
-		to the message itself.
+		to read for this specific message. We prepend a 4-byte integer (length of tag + body)
+		to the message itself. The 1-byte tag tells the receiver how to decode the body.
 		"""
 		try:
-			msg = pickle.dumps(object_data)
 			# Pack the length of the message into 4 bytes (big-endian unsigned int)
-			msg = struct.pack('>I', len(msg)) + msg
+			msg = _TCP_FRAME_HEADER.pack(len(body) + 1, tag) + body
 			socket_obj.sendall(msg)
 		except (ConnectionError, OSError):
 			pass
 
 	@staticmethod
-	def receive_object_over_tcp(socket_obj):
+	def receive_frame_over_tcp(socket_obj):
 		"""
-		Receives a length-prefixed pickled object over TCP.
+		Receives a length-prefixed tagged message over TCP.
 		
 		First reads 4 bytes to determine the size of the incoming message,
-		then reads exactly that many bytes to retrieve the full pickle payload.
+		then reads exactly that many bytes. Returns (tag, body_view) or None on failure.
 		"""
 		try:
 			# 1. Read the 4-byte header to get message length
-			raw_msglen = NetUtils.receive_all_bytes(socket_obj, 4)
+			raw_msglen = NetUtils.receive_all_bytes(socket_obj, _TCP_HEADER.size)
 			if not raw_msglen: 
 				NetUtils.debug_log("Failed to read length header", "RECV_TCP")
 				return None
-			msglen = struct.unpack('>I', raw_msglen)[0]
+			msglen = _TCP_HEADER.unpack(raw_msglen)[0]
 			
 			# 2. Read the actual message data based on the length
 			data = NetUtils.receive_all_bytes(socket_obj, msglen)
 			if not data: 
 				NetUtils.debug_log("Failed to read data payload", "RECV_TCP")
 				return None
-			return pickle.loads(data)
-		except (ConnectionError, OSError, pickle.UnpicklingError) as e:
+			return data[0], memoryview(data)[1:]
+		except (ConnectionError, OSError) as e:
+			NetUtils.debug_log(f"error: {e}", "RECV_TCP")
+			return None
+
+	@staticmethod
+	def send_object_over_tcp(socket_obj, object_data):
+		"""Encodes an object with msgpack and sends it as a TCP_MSG_OBJECT frame."""
+		NetUtils.send_frame_over_tcp(socket_obj, TCP_MSG_OBJECT, _ENC.encode(object_data))
+
+	@staticmethod
+	def receive_object_over_tcp(socket_obj):
+		"""Receives a TCP_MSG_OBJECT frame and decodes its msgpack body. Returns None on failure."""
+		frame = NetUtils.receive_frame_over_tcp(socket_obj)
+		if frame is None or frame[0] != TCP_MSG_OBJECT:
+			return None
+		try:
+			return _PAYLOAD_DEC.decode(frame[1])
+		except msgspec.DecodeError as e:
 			NetUtils.debug_log(f"error: {e}", "RECV_TCP")
 			return None
 
@@ -107,14 +358,93 @@ class NetUtils:
 		"""
 		Helper to ensure exactly `num_bytes` are read from the socket.
 		TCP `recv` can return fewer bytes than requested, so this loops until finished.
+		Chunks are read straight into one preallocated buffer instead of concatenating bytes.
+		Returns the filled `bytearray` (no final copy); `struct.unpack` and msgspec decoders accept it as-is.
 		"""
-		data = b''
-		while len(data) < num_bytes:
-			packet = socket_obj.recv(num_bytes - len(data))
-			if not packet: return None
-			data += packet
-		return data
+		buf = bytearray(num_bytes)
+		view = memoryview(buf)
+		received = 0
+		while received < num_bytes:
+			count = socket_obj.recv_into(view[received:])
+			if not count: return None
+			received += count
+		return buf
 	
+	@staticmethod
+	def configure_tcp_socket(socket_obj):
+		"""
+		Tunes a TCP socket for small control messages.
+		Disables Nagle's algorithm so handshake messages aren't held back waiting for ACKs,
+		enables keepalive so dead peers are eventually detected by blocking readers, and sizes
+		the socket buffers. On Linux, also asks for immediate ACKs (TCP_QUICKACK).
+		Can be applied to a listening socket too; accepted sockets inherit most of these options.
+		"""
+		try:
+			socket_obj.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+			socket_obj.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+			socket_obj.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, TCP_SOCKET_BUFFER)
+			socket_obj.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, TCP_SOCKET_BUFFER)
+			if hasattr(socket, "TCP_QUICKACK"):
+				socket_obj.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+		except OSError as e:
+			NetUtils.debug_log(f"Could not configure TCP socket: {e}", "TCP")
+
+	@staticmethod
+	def configure_udp_socket(socket_obj, buffer_size=UDP_SOCKET_BUFFER):
+		"""
+		Enlarges a UDP socket's send and receive buffers so bursts of datagrams aren't dropped
+		while the owning thread is busy. The kernel may cap the size (net.core.rmem_max / wmem_max).
+		"""
+		try:
+			socket_obj.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, buffer_size)
+			socket_obj.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, buffer_size)
+		except OSError as e:
+			NetUtils.debug_log(f"Could not configure UDP socket: {e}", "UDP")
+
+	@staticmethod
+	def pack_udp_payload(frame):
+		"""
+		Prefixes a UDP frame with its encoding. Frames of at least UDP_COMPRESS_THRESHOLD bytes are
+		zlib-compressed (level 1 for speed) when that actually makes them smaller; small ones are sent raw.
+		"""
+		if len(frame) >= UDP_COMPRESS_THRESHOLD:
+			compressed = zlib.compress(frame, 1)
+			if len(compressed) < len(frame):
+				return _UDP_ZLIB_PREFIX + compressed
+		return _UDP_RAW_PREFIX + frame
+
+	@staticmethod
+	def unpack_udp_payload(data, max_size):
+		"""
+		Reverses pack_udp_payload. Raises ValueError or zlib.error for malformed datagrams.
+		At most `max_size + 1` bytes are returned (and inflated, so a zlib bomb from any LAN peer is cheap);
+		a result longer than `max_size` means the frame was bigger than that and has been cut short.
+		"""
+		encoding = data[:1]
+		if encoding == _UDP_ZLIB_PREFIX:
+			return zlib.decompressobj().decompress(data[1:], max_size + 1)
+		if encoding == _UDP_RAW_PREFIX:
+			return bytes(data[1:max_size + 2])
+		raise ValueError(f"Unknown UDP payload encoding {bytes(encoding)!r}")
+
+	@staticmethod
+	def _sendto_loop(socket_obj, payload, addrs):
+		"""Portable fallback for _UDPBatchSender: one `sendto` per address."""
+		failed = []
+		sendto = socket_obj.sendto # Hoisted: the loop body only touches locals
+		for i, addr in enumerate(addrs):
+			try:
+				sendto(payload, addr)
+			except OSError:
+				failed.append(i)
+		return failed
+
+	@staticmethod
+	def _pack_sockaddr_in(addr):
+		"""Builds a raw 16-byte `struct sockaddr_in` for an IPv4 (ip, port) tuple."""
+		ip, port = addr[0], addr[1]
+		return _SOCKADDR_FAMILY + _NET_PORT.pack(port) + socket.inet_aton(ip) + bytes(8)
+
 	@staticmethod
 	def get_local_ip():
 		"""Returns the local IP address of this machine."""
@@ -166,10 +496,11 @@ class LANDiscoveryService(DiscoveryService):
 			self.sock.close()
 
 	def _broadcast_loop(self, game_id, port):
+		# The beacon never changes while advertising, so encode it (and look up the hostname) once
+		payload = _BEACON.pack(BEACON_MAGIC, BEACON_VERSION, port, socket.gethostname().encode(), game_id.encode())
 		while self.advertising:
-			msg = {"game_id": game_id, "host_name": socket.gethostname(), "tcp_port": port}
 			try: 
-				self.sock.sendto(pickle.dumps(msg), ('<broadcast>', self.broadcast_port))
+				self.sock.sendto(payload, ('<broadcast>', self.broadcast_port))
 			except: pass
 			time.sleep(BROADCAST_INTERVAL)
 
@@ -185,11 +516,12 @@ class LANDiscoveryService(DiscoveryService):
 			list[dict]: A list of found servers, each containing 'name', 'ip', and 'port'.
 		"""
 		discovered_hosts = []
+		seen = set() # (ip, tcp_port) keys already in discovered_hosts
 		sock = self._create_discovery_socket()
 		
 		try:
 			print(f"Searching for games ('{game_id}') on LAN for {timeout}s...")
-			self._listen_for_responses(sock, discovered_hosts, game_id, timeout)
+			self._listen_for_responses(sock, discovered_hosts, seen, game_id, timeout)
 		finally:
 			sock.close()
 			
@@ -207,32 +539,43 @@ class LANDiscoveryService(DiscoveryService):
 			pass 
 		return sock
 
-	def _listen_for_responses(self, sock, discovered_hosts, target_game_id, timeout):
+	def _listen_for_responses(self, sock, discovered_hosts, seen, target_game_id, timeout):
 		end_time = time.time() + timeout
+		# Beacons are fixed-size; one spare byte lets oversized packets be told apart and ignored
+		buf = bytearray(_BEACON.size + 1)
+		view = memoryview(buf)
 		while time.time() < end_time:
 			try:
-				data, addr = sock.recvfrom(UDP_BUFFER_SIZE)
-				self._process_packet(data, addr, discovered_hosts, target_game_id)
+				nbytes, addr = sock.recvfrom_into(buf)
+				self._process_packet(view[:nbytes], addr, discovered_hosts, seen, target_game_id)
 			except socket.timeout: 
 				continue
-			except (pickle.UnpicklingError, EOFError, KeyError): 
+			except OSError as e:
+				# e.g. WSAEMSGSIZE on Windows when a stray datagram is larger than the buffer
+				NetUtils.debug_log(f"Ignoring unreadable packet: {e}", "DISCOVERY")
 				continue
 
-	def _process_packet(self, data, addr, discovered_hosts, target_game_id):
-		try:
-			message = pickle.loads(data)
-			if message.get("game_id") == target_game_id:
-				host_info = {
-					"name": message.get("host_name", addr[0]),
-					"ip": addr[0],
-					"tcp_port": message.get("tcp_port"),
-					"game_id": message.get("game_id")
-				}
-				if not any(h['ip'] == host_info['ip'] and h['tcp_port'] == host_info['tcp_port'] for h in discovered_hosts):
-					discovered_hosts.append(host_info)
-					print(f"Found: {host_info['name']} at {host_info['ip']}:{host_info['tcp_port']}")
-		except Exception:
-			pass
+	def _process_packet(self, data, addr, discovered_hosts, seen, target_game_id):
+		# Anything that isn't exactly one beacon with our magic and version is rejected here
+		if len(data) != _BEACON.size:
+			return
+		magic, version, tcp_port, host_name, game_id = _BEACON.unpack_from(data)
+		if magic != BEACON_MAGIC or version != BEACON_VERSION:
+			return
+		if game_id != _BEACON_FIELD.pack(target_game_id.encode()):
+			return
+		key = (addr[0], tcp_port)
+		if key in seen:
+			return
+		seen.add(key)
+		host_info = {
+			"name": host_name.rstrip(b'\0').decode('utf-8', 'replace') or addr[0],
+			"ip": addr[0],
+			"tcp_port": tcp_port,
+			"game_id": target_game_id
+		}
+		discovered_hosts.append(host_info)
+		print(f"Found: {host_info['name']} at {host_info['ip']}:{host_info['tcp_port']}")
 
 # --- Managers & Core Classes ---
 
@@ -256,8 +599,11 @@ class Server:
 	Handles:
 	- TCP connections for reliable client registration and ID assignment.
 	- UDP listener for receiving high-frequency game state updates from clients.
-	- UDP broadcast loop for sending the consolidated 'world state' to all clients.
+	- UDP broadcast tick for sending the consolidated 'world state' to all clients
+	  (a full keyframe every KEYFRAME_INTERVAL seconds, only changed entries in between).
 	- Game discovery advertisement (optional).
+	
+	All sockets and the broadcast tick run on a single selector loop thread, so server state needs no lock.
 	"""
 	def __init__(self, host, tcp_port, broadcast_port, game_id=DEFAULT_GAME_ID, discovery_service=None):
 		self.host = host
@@ -267,27 +613,64 @@ class Server:
 		# Use provided discovery service or default to None
 		self.discovery_service = discovery_service
 		
+		# Copy-on-write: the event loop builds a new dict and rebinds it, so other threads can read it safely.
+		# Maps 16-byte client UUID -> that client's raw msgpack payload; the server never decodes it.
 		self.game_state = {} 
-		self.client_map = {} 
+		# Internal maps are keyed by the 16-byte client UUID carried in every UDP frame
+		self.client_map = {} # 16-byte UUID -> (ip, port) UDP address
+		self._targets = ((), (), ()) # (ids, addrs, raw sockaddrs) snapshot of client_map, rebuilt only on join/leave
+		self._sockaddrs = {} # 16-byte UUID -> raw sockaddr_in bytes, packed once when the client joins
 		self.clients_tcp = []
+		self._tcp_conns = {} # socket -> _TCPConnection
+		self._handshake_body = _HANDSHAKE.pack(game_id.encode())
+		self._client_ids = {} # 16-byte UUID -> string client_id assigned over TCP (for logs)
+		self._dropped = {} # 16-byte UUID -> datagrams dropped because the send buffer was full
+		self._last_seen = {} # 16-byte UUID -> time.monotonic() of the client's last UDP frame
+		
+		# Broadcasts carry only the entries touched since the previous one (plus periodic keyframes)
+		self._dirty = set() # Client UUIDs whose payload changed since the last broadcast
+		self._removed = set() # Client UUIDs that left since the last broadcast
+		self._broadcast_seq = 0
+		self._last_keyframe = 0.0
+		self._force_keyframe = False # Set when a client joins so it doesn't wait for the next keyframe
+		self._bcast_buf = bytearray(UDP_BUFFER_SIZE) # Reused to assemble each broadcast before compression
+		self._tcp_rx = memoryview(bytearray(TCP_RECV_CHUNK)) # Shared recv_into scratch for all TCP clients
 		
-		self.lock = threading.Lock()
 		self.running = True
+		self.sel = selectors.DefaultSelector() # Multiplexes the TCP listener, every client connection and UDP
 
 		# Initialize UDP Socket for game updates
 		self.udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		NetUtils.configure_udp_socket(self.udp_sock)
 		self.udp_sock.bind((self.host, 0)) 
 		self.udp_port = self.udp_sock.getsockname()[1]
+		# _ID_ASSIGNMENT frames only differ in the client UUID, so the rest is packed once
+		self._id_assignment_prefix = self._handshake_body # Same zero-padded game ID field
+		self._id_assignment_suffix = _NET_PORT.pack(self.udp_port)
+		# Non-blocking so one backed-up client can't stall the broadcast to everyone else
+		self.udp_sock.setblocking(False)
+		self._udp_sender = _UDPBatchSender(self.udp_sock) # Reuses its sendmmsg arrays every tick
+		# Drains a whole batch of datagrams per syscall into reused buffers (recvmmsg on Linux)
+		self._udp_receiver = _UDPBatchReceiver(self.udp_sock)
 
 	def log(self, msg):
 		timestamp = time.strftime("%H:%M:%S")
 		print(f"[{timestamp}][SERVER] {msg}")
 
 	def start(self):
-		"""Starts all server threads and discovery."""
-		threading.Thread(target=self._run_tcp_server, daemon=True).start()
-		threading.Thread(target=self._run_udp_listener, daemon=True).start()
-		threading.Thread(target=self._run_broadcast_loop, daemon=True).start()
+		"""Starts the server's event loop thread and discovery."""
+		# Listen before returning so a client connecting right after start() isn't refused
+		try:
+			server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+			server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+			NetUtils.configure_tcp_socket(server_sock)
+			server_sock.bind((self.host, self.tcp_port))
+			server_sock.listen()
+		except OSError as e:
+			self.log(f"Could not listen on {self.host}:{self.tcp_port}: {e}")
+			return
+		self.log(f"Game server ('{self.game_id}') listening on {self.host}:{self.tcp_port}")
+		threading.Thread(target=self._run_event_loop, args=(server_sock,), daemon=True).start()
 		
 		# Start advertising presence
 		if self.discovery_service:
@@ -295,117 +678,327 @@ class Server:
 		
 		self.log(f"UDP listening on port {self.udp_port}")
 
-	def _run_tcp_server(self):
-		"""Handles new client connections via TCP."""
-		server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-		server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-		server_sock.bind((self.host, self.tcp_port))
-		server_sock.listen()
-		self.log(f"Game server ('{self.game_id}') listening on {self.host}:{self.tcp_port}")
+	def _run_event_loop(self, server_sock):
+		"""Services TCP connections and UDP traffic and runs the broadcast tick, all on one selector loop."""
+		server_sock.setblocking(False)
+		self.sel.register(server_sock, selectors.EVENT_READ, self._accept_client_tcp)
+		self.sel.register(self.udp_sock, selectors.EVENT_READ, self._receive_udp)
 		
+		interval = 1.0 / SERVER_TPS
+		next_tick = time.monotonic()
+		next_reap = next_tick + REAP_INTERVAL
 		try:
 			while self.running:
-				try:
-					client_sock, _ = server_sock.accept()
-					threading.Thread(target=self._handle_client_tcp, args=(client_sock,), daemon=True).start()
-				except OSError: break
+				# Sleep in select() until a socket is ready or the next broadcast is due.
+				# Each registration's data is the callback that services its socket.
+				for key, mask in self.sel.select(timeout=max(0.0, next_tick - time.monotonic())):
+					key.data(key.fileobj, mask)
+				
+				now = time.monotonic()
+				if now >= next_tick:
+					self._broadcast_udp_state()
+					next_tick += interval
+					# Fell more than a tick behind: skip ahead instead of bursting to catch up
+					if next_tick < now: next_tick = now + interval
+				if now >= next_reap:
+					self._reap_stale_clients(now)
+					next_reap = now + REAP_INTERVAL
+		except OSError as e:
+			self.log(f"Event loop stopped: {e}")
 		finally:
+			for client_sock in list(self._tcp_conns):
+				self._close_client_tcp(client_sock)
+			self.sel.unregister(self.udp_sock)
+			self.sel.unregister(server_sock)
 			server_sock.close()
 
-	def _run_broadcast_loop(self):
-		"""Continuously broadcasts game state at a fixed tick rate."""
-		interval = 1.0 / SERVER_TPS
-		while self.running:
-			start_time = time.time()
-			self._broadcast_udp_state()
-			elapsed = time.time() - start_time
-			sleep_time = interval - elapsed
-			if sleep_time > 0:
-				time.sleep(sleep_time)
-
-	def _run_udp_listener(self):
-		"""Continuously receives UDP packets from clients."""
-		while self.running:
-			try:
-				data, addr = self.udp_sock.recvfrom(UDP_BUFFER_SIZE)
-				self._process_client_packet(data, addr)
-			except OSError as e:
-				if VERBOSE: self.log(f"UDP: OSError in listener: {e}")
-				break
+	def _receive_udp(self, udp_sock, mask):
+		"""Drains the queued client datagrams and applies them to the game state."""
+		try:
+			batch = self._udp_receiver.recv()
+		except OSError as e:
+			if VERBOSE: self.log(f"UDP: OSError in listener: {e}")
+			return
+		updates = [self._decode_client_packet(data, addr) for data, addr in batch]
+		self._apply_client_updates([u for u in updates if u is not None])
 
-	def _process_client_packet(self, data, addr):
-		"""Unpacks client data, updates internal state, and broadcasts to all."""
+	def _decode_client_packet(self, data, addr):
+		"""
+		Unpacks a client frame into (id_bytes, frame_type, payload, addr), or None if invalid.
+		The payload is left as raw msgpack bytes and forwarded to clients as-is.
+		`data` is a view into the listener's reused receive buffer, so it must not be kept.
+		"""
 		try:
-			# Decompress data
-			decompressed = zlib.decompress(data)
-			client_id, payload = pickle.loads(decompressed)
-			if VERBOSE: self.log(f"UDP: Received from {client_id} at {addr}: {payload}")
-			
-			with self.lock:
-				# Register client's UDP address if new
-				if client_id not in self.client_map:
-					self.client_map[client_id] = addr
-					if VERBOSE: self.log(f"UDP: Added {client_id} to client_map: {addr}")
+			# Oversized states come back cut short and are rejected below, once the sender is known
+			frame = NetUtils.unpack_udp_payload(data, _FRAME.size + _MAX_STATE_PAYLOAD)
+			frame_type, id_bytes = _FRAME.unpack_from(frame)
+			if id_bytes not in self._client_ids:
+				# Only clients that completed the TCP handshake may send state
+				if VERBOSE: self.log(f"UDP: Dropping frame from unknown client at {addr}")
+				return None
+			payload = None
+			if frame_type == FRAME_STATE:
+				payload = frame[_FRAME.size:]
+				if len(payload) > _MAX_STATE_PAYLOAD:
+					# Would not fit a broadcast record: keep the client's previous state, but still count it as alive
+					self.log(f"UDP: Dropping state from {self._client_ids.get(id_bytes)}, it is larger than {_MAX_STATE_PAYLOAD} bytes")
+					frame_type, payload = FRAME_REGISTER, None
+			elif frame_type != FRAME_REGISTER:
+				if VERBOSE: self.log(f"UDP: Unknown frame type {frame_type} from {addr}")
+				return None
+			if VERBOSE: self.log(f"UDP: Received from {self._client_ids.get(id_bytes)} at {addr}: {payload}")
+			return id_bytes, frame_type, payload, addr
+		except (zlib.error, struct.error, ValueError) as e:
+			if VERBOSE: self.log(f"UDP: Error decoding data from {addr}: {e}, Data: {bytes(data)}")
+			return None
+
+	def _apply_client_updates(self, updates):
+		"""Applies a batch of decoded client frames to the game state, publishing it once."""
+		if not updates:
+			return
+		new_state = None
+		now = time.monotonic()
+		last_seen = self._last_seen
+		for id_bytes, frame_type, payload, addr in updates:
+			last_seen[id_bytes] = now
+			# Register client's UDP address if new
+			if id_bytes not in self.client_map:
+				self.client_map[id_bytes] = addr
+				self._sockaddrs[id_bytes] = NetUtils._pack_sockaddr_in(addr)
+				self._publish_targets()
+				self._force_keyframe = True
+				if VERBOSE: self.log(f"UDP: Added {self._client_ids.get(id_bytes)} to client_map: {addr}")
+			if frame_type == FRAME_REGISTER:
+				continue
 					
-				# Update the authoritative game state with client's payload
-				self.game_state[client_id] = payload
-				if VERBOSE: self.log(f"UDP: Updated game_state for {client_id}. Current state keys: {list(self.game_state.keys())}")
-				
-		except (zlib.error, pickle.UnpicklingError, ValueError) as e:
-			if VERBOSE: self.log(f"UDP: Error unpickling/unpacking data from {addr}: {e}, Data: {data}")
+			# Update the authoritative game state with client's payload
+			current = new_state if new_state is not None else self.game_state
+			if current.get(id_bytes) != payload:
+				if new_state is None: new_state = dict(self.game_state)
+				new_state[id_bytes] = payload
+				self._dirty.add(id_bytes)
+		if new_state is not None:
+			# Publish the new dict; _dirty tells the broadcast tick what changed
+			self.game_state = new_state
+			if VERBOSE: self.log(f"UDP: Updated game_state. Current state keys: {list(new_state.keys())}")
+
+	def _reap_stale_clients(self, now):
+		"""Disconnects clients that sent nothing for DISCONNECT_TIMEOUT (e.g. TCP dropped without a FIN)."""
+		stale = {cid for cid, seen in self._last_seen.items() if now - seen > DISCONNECT_TIMEOUT}
+		if not stale:
+			return
+		for client_sock, conn in list(self._tcp_conns.items()):
+			if conn.id_bytes in stale:
+				self.log(f"Client {conn.client_id} timed out.")
+				self._close_client_tcp(client_sock)
+
+	def _publish_targets(self):
+		"""Rebuilds the broadcast target snapshot after client_map changes."""
+		self._targets = (tuple(self.client_map), tuple(self.client_map.values()), tuple(self._sockaddrs[cid] for cid in self.client_map))
 
 	def _broadcast_udp_state(self):
-		"""Packs entire game state and blasts it to all known UDP clients."""
+		"""Packs the changed (or, on keyframes, entire) game state and blasts it to all known UDP clients."""
 		try:
-			with self.lock:
-				if not self.client_map: 
+			# Membership only changes on join/leave, which rebuild the snapshot
+			client_ids, addrs, sockaddrs = self._targets
+			if not addrs:
+				return
+			
+			state = self.game_state
+			now = time.monotonic()
+			
+			if self._force_keyframe or now - self._last_keyframe >= KEYFRAME_INTERVAL:
+				# Periodic full snapshot lets late joiners and clients that lost a delta recover
+				self._force_keyframe = False
+				self._last_keyframe = now
+				kind, changed, removed = STATE_FULL, state, ()
+			else:
+				# Only entries touched since the last broadcast. Nothing changed means nothing to
+				# send; keyframes (KEYFRAME_INTERVAL < DISCONNECT_TIMEOUT) still act as the heartbeat
+				if not self._dirty and not self._removed:
 					return
-				raw_payload = pickle.dumps(self.game_state)
-				# Level 1 compression for speed
-				compressed_payload = zlib.compress(raw_payload, 1)
-				
-				for _, addr in self.client_map.items():
-					self.udp_sock.sendto(compressed_payload, addr)
+				kind = STATE_DELTA
+				changed = {cid: state[cid] for cid in self._dirty}
+				removed = self._removed
+			self._dirty = set()
+			self._removed = set()
+			# Skipped ticks don't consume a sequence number, so clients see no gap
+			self._broadcast_seq = (self._broadcast_seq + 1) & 0xFFFFFFFF
+			
+			# Client payloads are copied through verbatim, so nothing is re-serialized per tick
+			size = (_STATE_HEADER.size + len(changed) * _STATE_RECORD.size
+				+ sum(map(len, changed.values())) + 16 * len(removed))
+			if size > len(self._bcast_buf):
+				self._bcast_buf = bytearray(size)
+			buf = self._bcast_buf
+			_STATE_HEADER.pack_into(buf, 0, kind, self._broadcast_seq, len(changed), len(removed))
+			offset = _STATE_HEADER.size
+			record = _STATE_RECORD.pack_into
+			for cid, entry in changed.items():
+				record(buf, offset, cid, len(entry))
+				offset += _STATE_RECORD.size
+				buf[offset:offset + len(entry)] = entry
+				offset += len(entry)
+			for cid in removed:
+				buf[offset:offset + 16] = cid
+				offset += 16
+			# Compressed only when large enough to benefit (e.g. keyframes in big lobbies)
+			packet = NetUtils.pack_udp_payload(memoryview(buf)[:offset])
+			
+			# Fan out (one sendmmsg syscall per batch on Linux)
+			for i in self._udp_sender.send(packet, addrs, sockaddrs):
+				# Send buffer was full: drop this tick for this client, state is resent next tick
+				id_bytes = client_ids[i]
+				self._dropped[id_bytes] = self._dropped.get(id_bytes, 0) + 1
 		except Exception as e:
-			if VERBOSE: self.log(f"UDP: Error broadcasting state: {e}")
+			self.log(f"UDP: Error broadcasting state: {e}")
 
-	def _handle_client_tcp(self, client_sock):
-		"""Handles initial client handshake, ID assignment, and disconnects."""
+	def _accept_client_tcp(self, server_sock, mask):
+		"""Accepts a pending connection and registers it with the event loop."""
 		try:
-			# 1. Receive Handshake (Check Game ID)
-			handshake = NetUtils.receive_object_over_tcp(client_sock)
-			if not handshake or handshake.get("game_id") != self.game_id:
-				client_sock.close()
+			client_sock, _ = server_sock.accept()
+		except BlockingIOError:
+			return
+		NetUtils.configure_tcp_socket(client_sock)
+		client_sock.setblocking(False)
+		self._tcp_conns[client_sock] = _TCPConnection()
+		self.sel.register(client_sock, selectors.EVENT_READ, self._service_client_tcp)
+
+	def _service_client_tcp(self, client_sock, mask):
+		"""Flushes queued output and reads whatever is available from a client, advancing its state."""
+		conn = self._tcp_conns[client_sock]
+		if mask & selectors.EVENT_WRITE:
+			self._flush_client_tcp(client_sock, conn)
+			if client_sock not in self._tcp_conns:
 				return
+		if not mask & selectors.EVENT_READ:
+			return
+		try:
+			nbytes = client_sock.recv_into(self._tcp_rx)
+		except BlockingIOError:
+			return
+		except OSError as e:
+			self.log(f"TCP Error {conn.client_id}: {e}")
+			nbytes = 0
+		if not nbytes:
+			self._close_client_tcp(client_sock)
+			return
+		conn.rxbuf += self._tcp_rx[:nbytes]
+		
+		# One recv may hold several frames (or part of one); consume every complete frame
+		while len(conn.rxbuf) >= 4:
+			msglen = _TCP_HEADER.unpack_from(conn.rxbuf)[0]
+			# A client only ever sends a handshake, then bare keyframe requests; reject any other
+			# length up front so a bogus header can't make rxbuf grow without bound
+			if msglen != (1 + _HANDSHAKE.size if conn.state == TCP_STATE_HANDSHAKE else 1):
+				self.log(f"TCP: Invalid {msglen}-byte frame from {conn.client_id or 'unregistered client'}, disconnecting.")
+				self._close_client_tcp(client_sock)
+				return
+			if len(conn.rxbuf) < 4 + msglen:
+				break
+			frame = bytes(conn.rxbuf[4:4 + msglen])
+			del conn.rxbuf[:4 + msglen]
+			
+			if conn.state == TCP_STATE_HANDSHAKE:
+				# 1. Receive Handshake (Check Game ID)
+				if frame[:1] != bytes((TCP_MSG_HANDSHAKE,)) or frame[1:] != self._handshake_body:
+					self._close_client_tcp(client_sock)
+					return
+				self._assign_client_id(client_sock, conn)
+				if client_sock not in self._tcp_conns:
+					return # Sending the ID failed and closed the connection
+			elif frame[:1] == bytes((TCP_MSG_KEYFRAME_REQUEST,)):
+				# Client missed a delta; the next broadcast is a full state for everyone
+				self._force_keyframe = True
+			# Other steady-state frames are ignored, the connection mainly signals disconnects
 
-			# 2. Assign Unique ID
-			client_id = str(uuid.uuid4())
-			with self.lock: self.clients_tcp.append(client_sock)
+	def _send_client_tcp(self, client_sock, conn, tag, body):
+		"""
+		Queues a tagged frame for a client and sends as much as the socket accepts right away.
+		Anything left is sent when the socket becomes writable, so a slow client never blocks the loop;
+		one that falls more than TCP_SEND_QUEUE_LIMIT frames behind is disconnected.
+		"""
+		if len(conn.outq) >= TCP_SEND_QUEUE_LIMIT:
+			self.log(f"Client {conn.client_id} is not reading, disconnecting.")
+			self._close_client_tcp(client_sock)
+			return
+		conn.outq.append(_TCP_FRAME_HEADER.pack(len(body) + 1, tag) + body)
+		self._flush_client_tcp(client_sock, conn)
 
-			# 3. Send ID + Server UDP Port to Client
-			NetUtils.send_object_over_tcp(client_sock, {
-				"type": "id_assignment",
-				"id": client_id,
-				"udp_port": self.udp_port
-			})
-			
-			self.log(f"Client {client_id} connected via TCP.")
+	def _flush_client_tcp(self, client_sock, conn):
+		"""Writes queued frames until the socket would block, then waits for EVENT_WRITE if needed."""
+		try:
+			while conn.pending or conn.outq:
+				if not conn.pending:
+					conn.pending = memoryview(conn.outq.popleft())
+				sent = client_sock.send(conn.pending)
+				conn.pending = conn.pending[sent:]
+		except BlockingIOError:
+			pass
+		except OSError as e:
+			self.log(f"TCP Error {conn.client_id}: {e}")
+			self._close_client_tcp(client_sock)
+			return
+		
+		# Only ask for writability while there is something left to send
+		events = selectors.EVENT_READ | (selectors.EVENT_WRITE if conn.pending or conn.outq else 0)
+		if events != conn.events:
+			conn.events = events
+			self.sel.modify(client_sock, events, self._service_client_tcp)
 
-			# 4. Keep TCP connection open to detect disconnects
-			while True:
-				msg = NetUtils.receive_object_over_tcp(client_sock)
-				if msg is None: break 
-				
-		except Exception as e:
-			self.log(f"TCP Error {client_id}: {e}")
-		finally:
-			# Cleanup on disconnect
-			with self.lock:
-				if client_sock in self.clients_tcp: self.clients_tcp.remove(client_sock)
-				if client_id in self.game_state: del self.game_state[client_id]
-				if client_id in self.client_map: del self.client_map[client_id]
-			client_sock.close()
-			self.log(f"Client {client_id} disconnected.")
+	def _assign_client_id(self, client_sock, conn):
+		"""Assigns a unique ID to a client that passed the handshake and sends it back."""
+		# 2. Assign Unique ID
+		client_uuid = uuid.uuid4()
+		conn.client_id = str(client_uuid)
+		conn.id_bytes = client_uuid.bytes
+		conn.state = TCP_STATE_STEADY
+		self.clients_tcp.append(client_sock)
+		self._client_ids[conn.id_bytes] = conn.client_id
+		self._last_seen[conn.id_bytes] = time.monotonic() # Counts from the handshake until its first frame
+
+		self.log(f"Client {conn.client_id} connected via TCP.")
+
+		# 3. Send ID + Server UDP Port to Client (may close the connection if the send fails)
+		self._send_client_tcp(client_sock, conn, TCP_MSG_ID_ASSIGNMENT,
+			self._id_assignment_prefix + conn.id_bytes + self._id_assignment_suffix)
+
+	def _close_client_tcp(self, client_sock):
+		"""Unregisters and closes a client connection, removing the client from the game. No-op if already closed."""
+		conn = self._tcp_conns.pop(client_sock, None)
+		if conn is None:
+			return
+		conn.rxbuf.clear() # Ends _service_client_tcp's frame loop, so nothing parses a closed connection
+		self.sel.unregister(client_sock)
+		client_id, id_bytes = conn.client_id, conn.id_bytes
+		# Cleanup on disconnect
+		if client_sock in self.clients_tcp: self.clients_tcp.remove(client_sock)
+		if id_bytes in self.game_state:
+			new_state = dict(self.game_state)
+			del new_state[id_bytes]
+			self.game_state = new_state
+			self._dirty.discard(id_bytes)
+			self._removed.add(id_bytes)
+		if self.client_map.pop(id_bytes, None) is not None:
+			del self._sockaddrs[id_bytes]
+			self._publish_targets()
+		self._dropped.pop(id_bytes, None)
+		self._last_seen.pop(id_bytes, None)
+		self._client_ids.pop(id_bytes, None)
+		client_sock.close()
+		if client_id: self.log(f"Client {client_id} disconnected.")
+
+class _TCPConnection:
+	"""Per-client state for the server's TCP event loop."""
+	__slots__ = ('state', 'rxbuf', 'outq', 'pending', 'events', 'client_id', 'id_bytes')
+	def __init__(self):
+		self.state = TCP_STATE_HANDSHAKE
+		self.rxbuf = bytearray() # Bytes received but not yet parsed into frames
+		self.outq = collections.deque() # Encoded frames waiting to be sent
+		self.pending = None # Unsent remainder of the frame currently being written
+		self.events = selectors.EVENT_READ # Events the socket is registered for
+		self.client_id = None
+		self.id_bytes = None # Binary form of client_id, the key used by the server's internal maps
 
 # Kept as a utility base class for easy sprite networking
 class NetSprite(simpleGE.Sprite):
@@ -418,14 +1011,21 @@ class NetSprite(simpleGE.Sprite):
 		if not self.is_local: self.hide()
 		
 	def get_net_state(self):
-		# Return owner_id, sprite_id, x, y, angle
-		return (self.net_id, self.sprite_id, self.x, self.y, self.imageAngle)
+		# Return owner_id, sprite_id, x, y, angle (x/y/angle quantized to NET_STATE_SCALE ints)
+		# Angle is wrapped to [0, 360) first so it always fits msgpack's 16-bit int encoding
+		return (self.net_id, self.sprite_id,
+			round(self.x * NET_STATE_SCALE),
+			round(self.y * NET_STATE_SCALE),
+			round((self.imageAngle % 360) * NET_STATE_SCALE) % (360 * NET_STATE_SCALE))
 
 	def set_net_state(self, state):
 		if not self.visible: self.show()
-		# Expecting tuple (x, y, angle)
+		# Expecting quantized tuple (x, y, angle) as produced by get_net_state
 		if isinstance(state, (tuple, list)) and len(state) >= 3:
-			self.x, self.y, self.imageAngle = state
+			x, y, angle = state[:3]
+			self.x = x / NET_STATE_SCALE
+			self.y = y / NET_STATE_SCALE
+			self.imageAngle = angle / NET_STATE_SCALE
 
 class NetworkScene(simpleGE.Scene):
 	"""
@@ -438,6 +1038,7 @@ class NetworkScene(simpleGE.Scene):
 		self.game_id = game_id
 		self.client = None
 		self.local_client_id = None # Will be set by the Client after ID assignment
+		self._last_handled_state = None # The latest_state dict last passed to handle_network_state
 	
 	def process(self):
 		# Check for disconnect every frame
@@ -452,18 +1053,24 @@ class NetworkScene(simpleGE.Scene):
 		"""Override this to handle state updates from server."""
 		if not self.client: return
 		state = self.client.get_latest_state()
-		if not state: 
+		# The client rebinds latest_state only when something changed, so identity means nothing new
+		if not state or state is self._last_handled_state: 
 			return
+		self._last_handled_state = state
 		if VERBOSE: print(f"NetworkScene: Passing state to handler. Keys: {list(state.keys())}")
 		self.handle_network_state(state)
 
 	def handle_network_state(self, state):
-		"""Override to process the entire game state dict."""
+		"""
+		Override to process the entire game state dict (shared with the client, do not modify it).
+		Only called when the state has changed since the last call.
+		"""
 		pass
 
 	def _send_local_state(self):
 		"""Override to send local state."""
-		if self.client and self.client.id:
+		# Gate before building the state so frames above the send rate don't pay for get_local_state()
+		if self.client and self.client.id and self.client.ready_to_send():
 			data = self.get_local_state()
 			if data is not None:
 				self.client.send_update(data)
@@ -477,6 +1084,11 @@ class NetworkScene(simpleGE.Scene):
 		print("Server disconnected. Stopping scene.")
 		self.stop()
 
+	def _wait_for_id(self):
+		"""Blocks (up to ID_WAIT_TIMEOUT) until the server assigns our ID, without polling."""
+		if self.client.connected and self.client.id_ready.wait(timeout=ID_WAIT_TIMEOUT):
+			self.local_client_id = self.client.id
+
 	def stop(self):
 		if self.client: self.client.stop()
 		super().stop()
@@ -497,14 +1109,6 @@ class HostScene(NetworkScene):
 		else:
 			print("[HOST SCENE] Initial client connection to server failed.")
 
-	def _wait_for_id(self):
-		"""Waits briefly for the internal client to connect to the internal server."""
-		start = time.time()
-		while not self.client.id and time.time() - start < ID_WAIT_TIMEOUT and self.client.connected:
-			time.sleep(ID_WAIT_INTERVAL)
-		if self.client.id:
-			self.local_client_id = self.client.id
-
 class ClientScene(NetworkScene):
 	def __init__(self, host, port=DEFAULT_TCP_PORT, game_id=DEFAULT_GAME_ID, window_size=(640, 480)):
 		super().__init__(host, port, game_id, window_size)
@@ -518,14 +1122,6 @@ class ClientScene(NetworkScene):
 		else:
 			print("[CLIENT SCENE] Initial client connection to server failed.")
 
-	def _wait_for_id(self):
-		"""Waits briefly for ID assignment from the server."""
-		start = time.time()
-		while not self.client.id and time.time() - start < ID_WAIT_TIMEOUT and self.client.connected:
-			time.sleep(ID_WAIT_INTERVAL)
-		if self.client.id:
-			self.local_client_id = self.client.id
-
 class Client:
 	"""
 	The network client.
@@ -539,16 +1135,28 @@ class Client:
 	def __init__(self, host, port, game_id=DEFAULT_GAME_ID):
 		self.tcp_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 		self.udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		NetUtils.configure_udp_socket(self.udp_sock)
 		# Set a timeout for UDP socket to detect disconnects (heartbeat)
 		self.udp_sock.settimeout(UDP_SOCKET_TIMEOUT) 
 		self.host = host
 		self.id = None
+		self.id_bytes = None # Binary form of self.id used in UDP frame headers
+		self.id_ready = threading.Event() # Set as soon as the server assigns our ID
 		self.server_udp_port = None
-		self.latest_state = {}
-		self.lock = threading.Lock()
+		self.latest_state = {} # Replaced wholesale on every update, never mutated in place
+		self._have_keyframe = False # Deltas are ignored until the first full state arrives
+		self._last_seq = 0 # Sequence number of the newest broadcast applied
+		self._keyframe_requested = False # A TCP keyframe request is outstanding
+		self._id_strs = {} # 16-byte client UUID -> string ID used as the latest_state key
 		self.running = True
 		self.connected = False # Connection status flag
 		self.last_packet_time = time.time()
+		
+		# Outbound rate cap and duplicate suppression (see ready_to_send/send_update)
+		self.send_hz = CLIENT_SEND_RATE
+		self._last_send_time = 0.0
+		self._last_sent_packet = None
+		self._last_frame_time = 0.0 # When a frame last actually went out (for keepalives)
 
 		try:
 			self.tcp_sock.settimeout(CONNECTION_TIMEOUT) # Timeout for initial connection
@@ -556,18 +1164,20 @@ class Client:
 			
 			# TCP Handshake
 			self.tcp_sock.connect((host, port))
+			NetUtils.configure_tcp_socket(self.tcp_sock)
 			self.tcp_sock.settimeout(None) # Restore blocking for handshake
 			
 			if VERBOSE: self.log("Connected. Sending handshake...")
-			NetUtils.send_object_over_tcp(self.tcp_sock, {"game_id": game_id})
+			NetUtils.send_frame_over_tcp(self.tcp_sock, TCP_MSG_HANDSHAKE, _HANDSHAKE.pack(game_id.encode()))
 			
 			# Wait for assignment
 			if VERBOSE: self.log("Waiting for ID assignment...")
-			response = NetUtils.receive_object_over_tcp(self.tcp_sock)
-			if response and response.get("type") == "id_assignment":
-				self.id = response["id"]
-				self.server_udp_port = response["udp_port"]
+			response = NetUtils.receive_frame_over_tcp(self.tcp_sock)
+			if response and response[0] == TCP_MSG_ID_ASSIGNMENT:
+				_, self.id_bytes, self.server_udp_port = _ID_ASSIGNMENT.unpack(response[1])
+				self.id = str(uuid.UUID(bytes=self.id_bytes))
 				self.connected = True # Successfully connected
+				self.id_ready.set()
 				self.log(f"Assigned ID: {self.id}. Server UDP at port {self.server_udp_port}")
 			else:
 				self.log(f"Received unexpected response: {response}")
@@ -593,15 +1203,29 @@ class Client:
 		
 		# Send a dummy packet first so server knows our UDP address
 		if self.id and self.server_udp_port:
+			register_frame = _FRAME.pack(FRAME_REGISTER, self.id_bytes)
 			if VERBOSE: self.log("Sending initial registration packet.")
-			self.send_update("init")
+			try:
+				self._send_frame(register_frame)
+			except OSError as e:
+				self.log(f"Error sending registration packet: {e}")
 		
 		self.last_packet_time = time.time() # Reset timer on start
 
+		# One receive buffer reused for every datagram instead of a fresh bytes object per packet
+		buf = bytearray(UDP_BUFFER_SIZE)
+		view = memoryview(buf)
 		while self.running and self.connected:
 			try:
-				data, _ = self.udp_sock.recvfrom(UDP_BUFFER_SIZE)
-				self._handle_udp_packet(data)
+				# Scenes that never send state still have to show up as alive or the server drops them
+				if time.monotonic() - self._last_frame_time >= CLIENT_KEEPALIVE_INTERVAL:
+					try:
+						self._send_frame(register_frame)
+					except OSError as e:
+						# Transient (e.g. network briefly unreachable); DISCONNECT_TIMEOUT decides if we're gone
+						if VERBOSE: self.log(f"Error sending keepalive: {e}")
+				nbytes, _ = self.udp_sock.recvfrom_into(buf, UDP_BUFFER_SIZE)
+				self._handle_udp_packet(view[:nbytes])
 			except socket.timeout:
 				self._handle_timeout()
 			except (ConnectionError, OSError) as e:
@@ -613,17 +1237,67 @@ class Client:
 				break
 
 	def _handle_udp_packet(self, data):
-		"""Process received UDP data."""
+		"""Process received UDP data (a view into the reused receive buffer, not kept past this call)."""
 		self.last_packet_time = time.time() # Update heartbeat timestamp
 		try:
-			# Decompress data
-			decompressed = zlib.decompress(data)
-			state = pickle.loads(decompressed)
+			frame = NetUtils.unpack_udp_payload(data, MAX_BROADCAST_SIZE)
+			if len(frame) > MAX_BROADCAST_SIZE:
+				if VERBOSE: self.log(f"Dropping broadcast larger than {MAX_BROADCAST_SIZE} bytes.")
+				return
+			kind, seq, n_changed, n_removed = _STATE_HEADER.unpack_from(frame)
+			# Drop broadcasts that arrive after a newer one (wraparound-safe comparison)
+			if self._have_keyframe and (seq - self._last_seq) & 0xFFFFFFFF >= 0x80000000:
+				return
+			
+			if kind == STATE_FULL:
+				state = {}
+				self._have_keyframe = True
+				self._keyframe_requested = False
+			elif kind == STATE_DELTA and self._have_keyframe:
+				if seq != (self._last_seq + 1) & 0xFFFFFFFF:
+					# Missed at least one broadcast, so our state may be stale until a full one arrives
+					self._request_keyframe()
+				self._last_seq = seq
+				if not n_changed and not n_removed: return
+				state = dict(self.latest_state)
+			else:
+				return
+			self._last_seq = seq
+			
+			view = memoryview(frame)
+			offset = _STATE_HEADER.size
+			for _ in range(n_changed):
+				id_bytes, length = _STATE_RECORD.unpack_from(frame, offset)
+				offset += _STATE_RECORD.size
+				try:
+					state[self._id_str(id_bytes)] = _PAYLOAD_DEC.decode(view[offset:offset + length])
+				except msgspec.DecodeError as e:
+					# One client's bad payload shouldn't cost us everyone else's state
+					if VERBOSE: self.log(f"Skipping undecodable state entry: {e}")
+				offset += length
+			for _ in range(n_removed):
+				state.pop(self._id_str(frame[offset:offset + 16]), None)
+				offset += 16
 			if VERBOSE: self.log(f"Received state. Keys: {list(state.keys())}")
-			with self.lock: self.latest_state = state
-		except (zlib.error, pickle.UnpicklingError, ValueError) as e:
+			# Rebinding the attribute is atomic, so readers never see a half-updated dict
+			self.latest_state = state
+		except (zlib.error, struct.error, ValueError) as e:
 			if VERBOSE: self.log(f"Error processing packet: {e}")
 
+	def _request_keyframe(self):
+		"""Asks the server (over TCP) to send a full state instead of waiting for the next keyframe."""
+		if self._keyframe_requested: return
+		self._keyframe_requested = True
+		if VERBOSE: self.log("Broadcast lost, requesting keyframe.")
+		NetUtils.send_frame_over_tcp(self.tcp_sock, TCP_MSG_KEYFRAME_REQUEST, b'')
+
+	def _id_str(self, id_bytes):
+		"""Converts a binary client UUID from a broadcast into its string ID (cached)."""
+		client_id = self._id_strs.get(id_bytes)
+		if client_id is None:
+			client_id = self._id_strs[id_bytes] = str(uuid.UUID(bytes=id_bytes))
+		return client_id
+
 	def _handle_timeout(self):
 		"""Handle socket timeout and check if server is effectively disconnected."""
 		if time.time() - self.last_packet_time > DISCONNECT_TIMEOUT:
@@ -632,22 +1306,37 @@ class Client:
 		elif VERBOSE: 
 			self.log("UDP socket timed out, checking connection status.")
 
+	def ready_to_send(self):
+		"""Returns True if enough time has passed since the last update to send another (`send_hz`)."""
+		return time.monotonic() - self._last_send_time >= 1.0 / self.send_hz
+
 	def send_update(self, data):
-		"""Packs data using pickle and sends via UDP."""
+		"""
+		Packs data with msgpack and sends via UDP. Packets identical to the last one sent are
+		skipped, except once every CLIENT_KEEPALIVE_INTERVAL so an idle client still shows up.
+		"""
 		if not (self.running and self.id and self.server_udp_port and self.connected): return
+		now = time.monotonic()
+		self._last_send_time = now
 		try:
-			# Send tuple: (client_id, payload)
-			raw_packet = pickle.dumps((self.id, data))
-			# Compress the packet (Level 1 for speed)
-			compressed_packet = zlib.compress(raw_packet, 1)
+			# Fixed header (frame type, binary client ID) + msgpack payload
+			raw_packet = _FRAME.pack(FRAME_STATE, self.id_bytes) + _ENC.encode(data)
+			if raw_packet == self._last_sent_packet and now - self._last_frame_time < CLIENT_KEEPALIVE_INTERVAL: return
+			self._last_sent_packet = raw_packet
 			
-			if VERBOSE: self.log(f"Sending update (size {len(compressed_packet)} bytes). Payload: {data}")
-			self.udp_sock.sendto(compressed_packet, (self.host, self.server_udp_port))
+			if VERBOSE: self.log(f"Sending update (size {len(raw_packet)} bytes). Payload: {data}")
+			self._send_frame(raw_packet)
 		except Exception as e:
 			if VERBOSE: self.log(f"Error sending update: {e}")
 
+	def _send_frame(self, raw_packet):
+		"""Encodes a raw frame (see NetUtils.pack_udp_payload) and sends it to the server's UDP port."""
+		self._last_frame_time = time.monotonic()
+		self.udp_sock.sendto(NetUtils.pack_udp_payload(raw_packet), (self.host, self.server_udp_port))
+
 	def get_latest_state(self):
-		with self.lock: return self.latest_state.copy()
+		"""Returns the newest world state. The dict is shared (never mutated after publishing), so treat it as read-only."""
+		return self.latest_state
 
 	def get_connected_status(self):
 		return self.connected